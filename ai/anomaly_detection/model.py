@@ -1,18 +1,32 @@
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-import networkx as nx
 
 class ProcurementDataAnalyzer:
     """
     Analyzes procurement data for patterns and relationships
     """
     
+    # Output formats supported by analyze_payment_patterns
+    OUTPUT_FORMATS = ('dict', 'frames', 'arrow')
+    
+    # Column used to rank each list section when a top_k limit is applied
+    TABLE_RANK_COLUMNS = {
+        'claim_stats.threshold_splitting': 'total_amount',
+        'supplier_flow.high_retention_vendors': 'retention_amount',
+        'supplier_flow.subsupplier_analysis.high_retention_suppliers': 'retention_amount',
+        'supplier_flow.subsupplier_analysis.top_subsuppliers': 'total_amount',
+        'timing_patterns.day_of_week_patterns': 'total_amount',
+        'vendor_patterns.vendor_concentration.top_5_vendors': 'claim_count',
+        'vendor_patterns.new_vendors.vendors': 'total_amount',
+        'vendor_patterns.high_variance_vendors.vendors': 'std_amount'
+    }
+    
     def __init__(self):
         """Initialize the data analyzer"""
         pass
     
-    def analyze_payment_patterns(self, claims_df, supplier_payments_df=None, subsupplier_payments_df=None):
+    def analyze_payment_patterns(self, claims_df, supplier_payments_df=None, subsupplier_payments_df=None,
+                                 output_format='dict', top_k=None, offset=0):
         """
         Analyze payment patterns for suspicious activity
         
@@ -20,10 +34,19 @@ class ProcurementDataAnalyzer:
             claims_df: DataFrame with claims data
             supplier_payments_df: Optional DataFrame with supplier payments
             subsupplier_payments_df: Optional DataFrame with subsupplier payments
+            output_format: 'dict' for nested dicts with record lists, 'frames' for
+                DataFrames or 'arrow' for pyarrow Tables in a separate 'tables' section
+            top_k: Optional maximum number of rows kept per list section
+            offset: Number of ranked rows to skip per list section (for pagination)
             
         Returns:
-            dict: Analysis results
+            dict: Analysis results. For 'frames' and 'arrow' output this is a dict with
+                'summary' (scalar results), 'tables' (list sections keyed by dotted path)
+                and 'row_counts' (total rows per list section before limiting)
         """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
         results = {}
         
         # Basic claim analysis
@@ -46,7 +69,75 @@ class ProcurementDataAnalyzer:
         if 'vendor_address' in claims_df.columns:
             results['vendor_patterns'] = self._analyze_vendors(claims_df)
         
-        return results
+        if output_format == 'dict':
+            return self._to_records(results, top_k, offset)
+        
+        # Split list sections from summary scalars and apply limits
+        summary, tables, row_counts = self._split_tables(results, top_k, offset)
+        
+        if output_format == 'arrow':
+            import pyarrow as pa
+            tables = {
+                path: pa.Table.from_pandas(df, preserve_index=False)
+                for path, df in tables.items()
+            }
+        
+        return {
+            'summary': summary,
+            'tables': tables,
+            'row_counts': row_counts
+        }
+    
+    def _split_tables(self, results, top_k=None, offset=0, prefix=''):
+        """Separate DataFrame sections from scalar results, ranking and limiting each table"""
+        summary = {}
+        tables = {}
+        row_counts = {}
+        
+        for key, value in results.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                summary[key], sub_tables, sub_counts = self._split_tables(
+                    value, top_k, offset, prefix=f"{path}."
+                )
+                tables.update(sub_tables)
+                row_counts.update(sub_counts)
+            elif isinstance(value, pd.DataFrame):
+                row_counts[path] = len(value)
+                tables[path] = self._limit_table(value, self.TABLE_RANK_COLUMNS.get(path), top_k, offset)
+            else:
+                summary[key] = value
+        
+        return summary, tables, row_counts
+    
+    def _limit_table(self, df, rank_column=None, top_k=None, offset=0):
+        """Return one ranked page of a table, or the table unchanged if no limit is set"""
+        if top_k is None and not offset:
+            return df
+        
+        # Rank rows so that pages hold the most significant entries first
+        if rank_column is not None and rank_column in df.columns:
+            df = df.sort_values(rank_column, ascending=False, kind='mergesort')
+        
+        end = offset + top_k if top_k is not None else None
+        return df.iloc[offset:end].reset_index(drop=True)
+    
+    def _to_records(self, results, top_k=None, offset=0, prefix=''):
+        """Convert DataFrame sections to record lists, keeping the nested dict layout"""
+        records = {}
+        
+        for key, value in results.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                records[key] = self._to_records(value, top_k, offset, prefix=f"{path}.")
+            elif isinstance(value, pd.DataFrame):
+                records[key] = self._limit_table(
+                    value, self.TABLE_RANK_COLUMNS.get(path), top_k, offset
+                ).to_dict('records')
+            else:
+                records[key] = value
+        
+        return records
     
     def _analyze_claims(self, claims_df):
         """Analyze basic claim statistics"""
@@ -93,7 +184,10 @@ class ProcurementDataAnalyzer:
                             'total_amount': just_below['amount'].sum()
                         })
             
-            stats['threshold_splitting'] = threshold_split_depts
+            stats['threshold_splitting'] = pd.DataFrame(
+                threshold_split_depts,
+                columns=['department', 'threshold', 'count', 'total_amount']
+            )
         
         return stats
     
@@ -139,7 +233,7 @@ class ProcurementDataAnalyzer:
                 'amount_claim': 'sum',
                 'retention_amount': 'sum',
                 'retention_rate': 'mean'
-            }).reset_index().to_dict('records')
+            }).reset_index()
         
         # Analyze subsupplier flow if data is available
         if subsupplier_payments_df is not None and not subsupplier_payments_df.empty:
@@ -194,7 +288,7 @@ class ProcurementDataAnalyzer:
                 'amount_subsupplier': 'sum',
                 'retention_amount': 'sum',
                 'retention_rate': 'mean'
-            }).reset_index().to_dict('records')
+            }).reset_index()
         
         # Analyze payment concentration
         if 'subsupplier' in subsupplier_payments_df.columns:
@@ -210,7 +304,7 @@ class ProcurementDataAnalyzer:
             
             # Flag high concentration
             results['high_concentration'] = results['concentration_ratio'] > 0.8
-            results['top_subsuppliers'] = subsupplier_counts.nlargest(4, 'total_amount').to_dict('records')
+            results['top_subsuppliers'] = subsupplier_counts.nlargest(4, 'total_amount')
         
         return results
     
@@ -240,7 +334,7 @@ class ProcurementDataAnalyzer:
         }).reset_index()
         dow_counts.columns = ['day_of_week', 'claim_count', 'total_amount']
         
-        results['day_of_week_patterns'] = dow_counts.to_dict('records')
+        results['day_of_week_patterns'] = dow_counts
         
         # Flag late-night submissions
         late_night = temp_df[temp_df['hour'].isin([22, 23, 0, 1, 2, 3])]
@@ -294,7 +388,7 @@ class ProcurementDataAnalyzer:
         
         top_vendors = vendor_groups.nlargest(5, 'claim_count')
         results['vendor_concentration'] = {
-            'top_5_vendors': top_vendors.to_dict('records'),
+            'top_5_vendors': top_vendors,
             'top_5_claim_pct': top_vendors['claim_count'].sum() / total_claims * 100 if total_claims > 0 else 0,
             'top_5_amount_pct': top_vendors['total_amount'].sum() / total_amount * 100 if total_amount > 0 else 0
         }
@@ -306,14 +400,14 @@ class ProcurementDataAnalyzer:
         results['new_vendors'] = {
             'count': len(new_vendors),
             'total_amount': new_vendors['total_amount'].sum(),
-            'vendors': new_vendors[['vendor_address', 'claim_count', 'total_amount']].to_dict('records')
+            'vendors': new_vendors[['vendor_address', 'claim_count', 'total_amount']]
         }
         
         # Flag high-variance vendors
         high_variance = vendor_groups[vendor_groups['std_amount'] > vendor_groups['avg_amount']]
         results['high_variance_vendors'] = {
             'count': len(high_variance),
-            'vendors': high_variance[['vendor_address', 'avg_amount', 'std_amount']].to_dict('records')
+            'vendors': high_variance[['vendor_address', 'avg_amount', 'std_amount']]
         }
         
         return results
@@ -0,0 +1,173 @@
+# anomaly_detection/result_store.py
+
+import os
+import json
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+
+def to_json_safe(value):
+    """
+    Recursively convert analysis output to plain JSON types
+
+    numpy scalars become Python scalars, timestamps become ISO strings and
+    NaN/inf become None, so the output parses with a strict JSON.parse.
+    """
+    if isinstance(value, dict):
+        return {key: to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ResultTableStore:
+    """
+    Writes columnar analysis results to Parquet or Arrow IPC files and reads them back page by page
+    """
+
+    FILE_EXTENSIONS = {
+        'parquet': '.parquet',
+        'ipc': '.arrow'
+    }
+
+    def __init__(self, output_dir, file_format='parquet', row_group_size=10000):
+        """
+        Initialize the result store
+
+        Args:
+            output_dir: Directory holding the summary and table files
+            file_format: 'parquet' or 'ipc' (Arrow IPC file format)
+            row_group_size: Rows per Parquet row group / IPC record batch, i.e. the read granularity
+        """
+        if file_format not in self.FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+
+    def write(self, results):
+        """
+        Write results produced by analyze_payment_patterns with 'frames' or 'arrow' output
+
+        Args:
+            results: dict with 'summary', 'tables' and 'row_counts' sections
+
+        Returns:
+            dict: Manifest mapping each table path to its file and total row count
+        """
+        import pyarrow as pa
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        manifest = {}
+        for path, table in results['tables'].items():
+            if isinstance(table, pd.DataFrame):
+                table = pa.Table.from_pandas(table, preserve_index=False)
+
+            file_path = os.path.join(self.output_dir, path + self.FILE_EXTENSIONS[self.file_format])
+            self._write_table(table, file_path)
+
+            manifest[path] = {
+                'file': os.path.basename(file_path),
+                'rows': table.num_rows,
+                'total_rows': results.get('row_counts', {}).get(path, table.num_rows)
+            }
+
+        # Summary scalars are small, so they stay plain JSON
+        with open(os.path.join(self.output_dir, 'summary.json'), 'w') as f:
+            json.dump(to_json_safe({
+                'summary': results['summary'],
+                'tables': manifest
+            }), f, indent=2, allow_nan=False, default=str)
+
+        return manifest
+
+    def read_summary(self):
+        """Read the summary scalars and table manifest"""
+        with open(os.path.join(self.output_dir, 'summary.json'), 'r') as f:
+            return json.load(f)
+
+    def read_page(self, path, offset=0, limit=100):
+        """
+        Read one page of a stored table, loading only the row groups that overlap it
+
+        Args:
+            path: Dotted table path, e.g. 'vendor_patterns.new_vendors.vendors'
+            offset: Index of the first row to return
+            limit: Maximum number of rows to return
+
+        Returns:
+            pyarrow.Table: The requested rows
+        """
+        import pyarrow as pa
+
+        # Only tables listed in the manifest can be read, so request input never builds a path
+        manifest = self.read_summary()['tables']
+        if path not in manifest:
+            raise ValueError(f"Unknown table: {path}")
+        file_path = os.path.join(self.output_dir, os.path.basename(manifest[path]['file']))
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Table not found: {path}")
+        if offset < 0 or limit < 0:
+            raise ValueError('offset and limit must be non-negative')
+
+        end = offset + limit
+        chunks = []
+        start = 0
+
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            source = pq.ParquetFile(file_path)
+            schema = source.schema_arrow
+            for i in range(source.num_row_groups):
+                size = source.metadata.row_group(i).num_rows
+                # Only decode row groups that overlap the requested page
+                if start + size > offset and start < end:
+                    chunks.append(self._slice_chunk(source.read_row_group(i), start, offset, end))
+                start += size
+                if start >= end:
+                    break
+            if not chunks:
+                return schema.empty_table()
+            return pa.concat_tables(chunks)
+
+        # IPC files are memory-mapped, so fetching a record batch does not copy it
+        source = pa.ipc.open_file(pa.memory_map(file_path, 'r'))
+        for i in range(source.num_record_batches):
+            batch = source.get_batch(i)
+            if start + batch.num_rows > offset and start < end:
+                chunks.append(self._slice_chunk(batch, start, offset, end))
+            start += batch.num_rows
+            if start >= end:
+                break
+        return pa.Table.from_batches(chunks, schema=source.schema)
+
+    def _slice_chunk(self, chunk, start, offset, end):
+        """Slice a row group or record batch starting at row `start` down to the page [offset, end)"""
+        lo = max(offset - start, 0)
+        hi = min(end - start, chunk.num_rows)
+        return chunk.slice(lo, hi - lo)
+
+    def _write_table(self, table, file_path):
+        """Write a single Arrow table in the configured format"""
+        import pyarrow as pa
+
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, file_path, row_group_size=self.row_group_size)
+        else:
+            with pa.OSFile(file_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=self.row_group_size)
@@ -0,0 +1,710 @@
+# anomaly_detection/scoring_service.py
+
+import os
+import json
+import time
+import queue
+import bisect
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .model import ProcurementDataAnalyzer
+from .result_store import to_json_safe
+
+
+def utc_now():
+    """Current time as naive UTC, matching how claim timestamps are stored"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FileDataSource:
+    """
+    Loads claims and payments from local CSV, JSON or Parquet files so the service can run offline
+    """
+
+    def __init__(self, claims_path, supplier_payments_path=None, subsupplier_payments_path=None):
+        """
+        Initialize the data source
+
+        Args:
+            claims_path: Path to the claims file
+            supplier_payments_path: Optional path to the supplier payments file
+            subsupplier_payments_path: Optional path to the subsupplier payments file
+        """
+        self.claims_path = claims_path
+        self.supplier_payments_path = supplier_payments_path
+        self.subsupplier_payments_path = subsupplier_payments_path
+
+    def load_claims(self):
+        """Load the claims DataFrame"""
+        return self._load(self.claims_path)
+
+    def load_supplier_payments(self):
+        """Load the supplier payments DataFrame, or None if not configured"""
+        return self._load(self.supplier_payments_path) if self.supplier_payments_path else None
+
+    def load_subsupplier_payments(self):
+        """Load the subsupplier payments DataFrame, or None if not configured"""
+        return self._load(self.subsupplier_payments_path) if self.subsupplier_payments_path else None
+
+    def _load(self, path):
+        """Read a file into a DataFrame based on its extension"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+        file_ext = os.path.splitext(path)[1].lower()
+        if file_ext == '.csv':
+            return pd.read_csv(path)
+        elif file_ext == '.json':
+            return pd.read_json(path, orient='records')
+        elif file_ext in ['.jsonl', '.ndjson']:
+            return pd.read_json(path, orient='records', lines=True)
+        elif file_ext == '.parquet':
+            return pd.read_parquet(path)
+        else:
+            raise ValueError(f"Unsupported file format: {file_ext}")
+
+
+class LatencyTracker:
+    """
+    Keeps a bounded window of request latencies per route and reports percentiles
+    """
+
+    def __init__(self, window=10000):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Number of most recent samples kept per route
+        """
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds):
+        """Record one request latency"""
+        with self._lock:
+            if route not in self._samples:
+                self._samples[route] = deque(maxlen=self.window)
+                self._counts[route] = 0
+            self._samples[route].append(seconds)
+            self._counts[route] += 1
+
+    def snapshot(self):
+        """Return count, p50, p99 and max latency (in ms) per route"""
+        with self._lock:
+            samples = {route: sorted(values) for route, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        metrics = {}
+        for route, values in samples.items():
+            metrics[route] = {
+                'count': counts[route],
+                'p50_ms': self._percentile(values, 50) * 1000,
+                'p99_ms': self._percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000
+            }
+        return metrics
+
+    def _percentile(self, sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list"""
+        rank = max(int(np.ceil(pct / 100 * len(sorted_values))) - 1, 0)
+        return sorted_values[rank]
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into small batches handled by a single worker thread
+    """
+
+    def __init__(self, handler, max_batch_size=64, max_delay=0.002):
+        """
+        Initialize the batcher
+
+        Args:
+            handler: Callable taking a list of items and returning a list of results in the same order
+            max_batch_size: Maximum number of items per batch
+            max_delay: Seconds to wait for more items after the first one arrives
+        """
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batch_sizes = deque(maxlen=10000)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, item, timeout=None):
+        """
+        Submit an item and block until its batch has been handled
+
+        Args:
+            item: Item passed to the handler
+            timeout: Optional seconds to wait for the result
+
+        Returns:
+            The handler's result for this item
+        """
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def stop(self):
+        """Stop the worker thread after the queued items are handled"""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        """Worker loop: wait for one item, then gather more until the batch is full or the delay passes"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self.batch_sizes.append(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                results = self.handler(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+            if stopping:
+                return
+
+
+class ScoringState:
+    """
+    Keeps claim aggregates warm in memory and scores claims against them
+    """
+
+    # Same heuristics as ProcurementDataAnalyzer
+    APPROVAL_THRESHOLDS = [10000, 50000, 100000]
+    LATE_NIGHT_HOURS = [22, 23, 0, 1, 2, 3]
+    MARKET_WINDOW = timedelta(days=30)
+    NEW_VENDOR_WINDOW = timedelta(days=30)
+    RECENT_WINDOW = timedelta(hours=1)
+
+    # Market average assumed when no claims fall in the window, as in web/app/pages/api/ai.js
+    DEFAULT_MARKET_AVERAGE = 10000
+
+    def __init__(self, claims_df, supplier_payments_df=None, subsupplier_payments_df=None,
+                 clock=utc_now, analysis_top_k=100):
+        """
+        Initialize the state from historical data
+
+        Args:
+            claims_df: DataFrame with claims data
+            supplier_payments_df: Optional DataFrame with supplier payments
+            subsupplier_payments_df: Optional DataFrame with subsupplier payments
+            clock: Callable returning the current time as naive UTC (overridable for offline tests)
+            analysis_top_k: Row limit per list section in the cached full analysis
+        """
+        self.clock = clock
+        self.analysis_top_k = analysis_top_k
+        self.analyzer = ProcurementDataAnalyzer()
+        self.supplier_payments_df = supplier_payments_df
+        self.subsupplier_payments_df = subsupplier_payments_df
+        self._lock = threading.RLock()
+        self._analysis_lock = threading.Lock()
+
+        self._claims_df = claims_df.copy()
+        self._pending = []
+        self._analysis = None
+        self._version = 0
+
+        # Timestamped claims ordered by create_time: parallel lists of keys, records
+        # and cumulative amounts, so any time window's average is two bisects away
+        self._times = []
+        self._claims = []
+        self._cumulative = []
+
+        # Running totals for global amount statistics
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+        # Per-vendor first claim time (None if no claim has a timestamp) and
+        # per-department near-threshold counts
+        self._vendor_first_claim = {}
+        self._near_threshold = {}
+
+        # Normalize the historical claims in one vectorized pass, oldest first.
+        # create_time is optional, as in the analyzer: untimed claims still count
+        # towards the global statistics but not towards the time windows.
+        history = claims_df.copy()
+        history['amount'] = pd.to_numeric(history['amount'], errors='coerce')
+        if 'create_time' in history.columns:
+            history['create_time'] = pd.to_datetime(
+                history['create_time'], errors='coerce', utc=True
+            ).dt.tz_localize(None)
+        else:
+            history['create_time'] = pd.NaT
+        history = history.dropna(subset=['amount']).sort_values('create_time', kind='mergesort')
+        for claim in history.to_dict('records'):
+            create_time = claim['create_time']
+            claim['create_time'] = None if pd.isna(create_time) else create_time.to_pydatetime()
+            self._fold(claim)
+
+    def add_claims(self, records):
+        """
+        Add new claims to the warm aggregates
+
+        Args:
+            records: List of claim dicts
+
+        Returns:
+            int: Number of claims added (claims without a numeric amount are rejected)
+        """
+        claims = [self._normalize(record) for record in records]
+        accepted = [(record, claim) for record, claim in zip(records, claims) if claim is not None]
+        accepted.sort(key=lambda pair: pair[1]['create_time'] or datetime.min)
+
+        with self._lock:
+            for record, claim in accepted:
+                self._fold(claim)
+                self._pending.append(record)
+            self._analysis = None
+            self._version += 1
+        return len(accepted)
+
+    def market_average(self, now=None):
+        """Average claim amount over the trailing market window, or None without data"""
+        now = now or self.clock()
+        with self._lock:
+            lo = bisect.bisect_right(self._times, now - self.MARKET_WINDOW)
+            hi = bisect.bisect_right(self._times, now)
+            if hi <= lo:
+                return None
+            total = self._cumulative[hi - 1] - (self._cumulative[lo - 1] if lo > 0 else 0.0)
+        return total / (hi - lo)
+
+    def score_claims(self, claims):
+        """
+        Score a batch of claims against one consistent snapshot of the aggregates
+
+        Args:
+            claims: List of claim dicts
+
+        Returns:
+            list: One score dict per claim
+        """
+        now = self.clock()
+        with self._lock:
+            market_avg = self.market_average(now)
+            mean = self._sum / self._count if self._count else 0.0
+            variance = self._sumsq / self._count - mean ** 2 if self._count > 1 else 0.0
+            # Sample standard deviation, as pandas .std() in the analyzer
+            std = (max(variance, 0.0) * self._count / (self._count - 1)) ** 0.5 if self._count > 1 else 0.0
+            if market_avg is None:
+                market_avg = self.DEFAULT_MARKET_AVERAGE
+
+            # A malformed claim only fails its own entry, never the rest of the batch
+            scores = []
+            for claim in claims:
+                try:
+                    scores.append(self._score(claim, now, market_avg, mean, std))
+                except Exception as e:
+                    claim_id = claim.get('claim_id') if isinstance(claim, dict) else None
+                    scores.append({'claim_id': claim_id, 'error': str(e)})
+            return scores
+
+    def fraud_alerts(self, limit=5):
+        """
+        Most recent claims that are far above the market average or were submitted in the last hour
+
+        Mirrors web/app/pages/api/ai.js, including its market average of
+        DEFAULT_MARKET_AVERAGE when no claims fall in the trailing window.
+
+        Args:
+            limit: Maximum number of alerts
+
+        Returns:
+            list: Alert dicts, newest first
+        """
+        now = self.clock()
+        recent_since = now - self.RECENT_WINDOW
+
+        alerts = []
+        with self._lock:
+            market_avg = self.market_average(now)
+            if market_avg is None:
+                market_avg = self.DEFAULT_MARKET_AVERAGE
+            threshold = market_avg * 2
+
+            # Walk newest first and stop as soon as enough alerts are found
+            for claim in reversed(self._claims):
+                if len(alerts) >= limit:
+                    break
+                is_large = claim['amount'] > threshold
+                if not is_large and claim['create_time'] <= recent_since:
+                    continue
+                alerts.append({
+                    'claim_id': claim.get('claim_id'),
+                    'vendor_address': claim.get('vendor_address'),
+                    'amount': claim['amount'],
+                    'severity': 'HIGH' if is_large else 'LOW',
+                    'message': (
+                        f"HIGH Suspicious Claim by {claim.get('vendor_address')}: ${claim['amount']} "
+                        f"(>{threshold:.2f} market avg) - Investigate"
+                        if is_large else
+                        f"Recent Claim by {claim.get('vendor_address')}: ${claim['amount']}"
+                    ),
+                    'time': claim['create_time'].isoformat()
+                })
+        return alerts
+
+    def analysis(self):
+        """Full analyzer report, cached until new claims arrive"""
+        # The analysis runs outside the state lock so scoring and alerts are never
+        # blocked by it; _analysis_lock only keeps two analyses from racing
+        with self._analysis_lock:
+            with self._lock:
+                if self._analysis is not None:
+                    return self._analysis
+                claims_df = self._claims_df
+                pending = self._pending
+                self._pending = []
+                version = self._version
+
+            if pending:
+                claims_df = pd.concat([claims_df, pd.DataFrame(pending)], ignore_index=True)
+            analysis = self.analyzer.analyze_payment_patterns(
+                claims_df.copy(),
+                self.supplier_payments_df.copy() if self.supplier_payments_df is not None else None,
+                self.subsupplier_payments_df.copy() if self.subsupplier_payments_df is not None else None,
+                top_k=self.analysis_top_k
+            )
+
+            with self._lock:
+                self._claims_df = claims_df
+                # Claims pushed while the analysis ran leave the cache empty
+                if self._version == version:
+                    self._analysis = analysis
+            return analysis
+
+    def stats(self):
+        """Basic counters describing the warm state"""
+        with self._lock:
+            return {
+                'claims': self._count,
+                'vendors': len(self._vendor_first_claim),
+                'pending_for_analysis': len(self._pending)
+            }
+
+    def _fold(self, claim):
+        """Fold one normalized claim into the aggregates (caller holds the lock)"""
+        create_time = claim['create_time']
+        if create_time is not None:
+            # Claims mostly arrive in time order, so this is usually an append
+            index = bisect.bisect_right(self._times, create_time)
+            self._times.insert(index, create_time)
+            self._claims.insert(index, claim)
+            previous = self._cumulative[index - 1] if index > 0 else 0.0
+            self._cumulative.insert(index, previous + claim['amount'])
+            for i in range(index + 1, len(self._cumulative)):
+                self._cumulative[i] += claim['amount']
+
+        self._count += 1
+        self._sum += claim['amount']
+        self._sumsq += claim['amount'] ** 2
+
+        vendor = claim.get('vendor_address')
+        if not self._is_missing(vendor):
+            first = self._vendor_first_claim.get(vendor)
+            if create_time is not None and (first is None or create_time < first):
+                self._vendor_first_claim[vendor] = create_time
+            else:
+                self._vendor_first_claim.setdefault(vendor, None)
+
+        department = claim.get('department_address')
+        threshold = self._threshold_below(claim['amount'])
+        if not self._is_missing(department) and threshold is not None:
+            key = (department, threshold)
+            self._near_threshold[key] = self._near_threshold.get(key, 0) + 1
+
+    def _score(self, claim, now, market_avg, mean, std):
+        """Heuristic 0-100 fraud score for one claim"""
+        claim_id = claim.get('claim_id')
+        claim = self._normalize(claim, default_time=now)
+        if claim is None:
+            return {'claim_id': claim_id, 'error': 'Claim is missing a numeric amount'}
+
+        amount = claim['amount']
+        score = 0
+        reasons = []
+
+        # Far above the trailing market average
+        if amount > market_avg * 2:
+            score += 40
+            reasons.append('amount_above_2x_market_avg')
+
+        # Statistical outlier (Z-score > 2)
+        if std > 0 and abs((amount - mean) / std) > 2:
+            score += 20
+            reasons.append('amount_outlier')
+
+        # Vendor with no history, or whose first claim is inside the new-vendor window
+        vendor = claim.get('vendor_address')
+        if not self._is_missing(vendor):
+            first = self._vendor_first_claim.get(vendor)
+            if vendor not in self._vendor_first_claim or (first is not None and first > now - self.NEW_VENDOR_WINDOW):
+                score += 15
+                reasons.append('new_vendor')
+
+        # Just below an approval threshold, possibly as part of a split purchase
+        threshold = self._threshold_below(amount)
+        if threshold is not None:
+            score += 15
+            reasons.append('just_below_threshold')
+            department = claim.get('department_address')
+            if not self._is_missing(department) and self._near_threshold.get((department, threshold), 0) + 1 >= 3:
+                score += 10
+                reasons.append('threshold_splitting')
+
+        if claim['create_time'].hour in self.LATE_NIGHT_HOURS:
+            score += 10
+            reasons.append('late_night_submission')
+
+        score = min(score, 100)
+        return {
+            'claim_id': claim.get('claim_id'),
+            'score': score,
+            'is_suspicious': score > 70,
+            'reasons': reasons,
+            'market_avg': market_avg
+        }
+
+    def _threshold_below(self, amount):
+        """Approval threshold the amount sits just below (within 10%), if any"""
+        for threshold in self.APPROVAL_THRESHOLDS:
+            if threshold * 0.9 < amount < threshold:
+                return threshold
+        return None
+
+    def _normalize(self, record, default_time=None):
+        """
+        Coerce amount and create_time to naive UTC
+
+        Returns None when the amount is unusable. A missing create_time becomes
+        default_time, or None to keep the claim out of the time windows.
+        """
+        amount = record.get('amount')
+        if not pd.api.types.is_scalar(amount):
+            return None
+        amount = pd.to_numeric(amount, errors='coerce')
+        if pd.isna(amount):
+            return None
+
+        create_time = record.get('create_time')
+        create_time = pd.to_datetime(create_time, errors='coerce') if pd.api.types.is_scalar(create_time) else pd.NaT
+        if pd.isna(create_time):
+            create_time = pd.Timestamp(default_time) if default_time is not None else None
+        elif create_time.tzinfo is not None:
+            create_time = create_time.tz_convert('UTC').tz_localize(None)
+
+        claim = dict(record)
+        claim['amount'] = float(amount)
+        claim['create_time'] = create_time.to_pydatetime() if create_time is not None else None
+        return claim
+
+    @staticmethod
+    def _is_missing(value):
+        """True for None and NaN-like placeholders left by DataFrame records"""
+        return value is None or (pd.api.types.is_scalar(value) and pd.isna(value))
+
+
+class ScoringService:
+    """
+    Local HTTP/JSON service answering claim scoring and fraud alert queries from warm state
+    """
+
+    def __init__(self, data_source, host='127.0.0.1', port=8765, max_batch_size=64, max_delay=0.002,
+                 clock=utc_now):
+        """
+        Initialize the service, loading all data once
+
+        Args:
+            data_source: Object with load_claims/load_supplier_payments/load_subsupplier_payments
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            max_batch_size: Maximum claims scored per batch
+            max_delay: Seconds to wait for concurrent requests before scoring a batch
+            clock: Callable returning the current time as naive UTC
+        """
+        self.state = ScoringState(
+            data_source.load_claims(),
+            data_source.load_supplier_payments(),
+            data_source.load_subsupplier_payments(),
+            clock=clock
+        )
+        self.metrics = LatencyTracker()
+        self.batcher = MicroBatcher(self.state.score_claims, max_batch_size, max_delay)
+        self.server = ThreadingHTTPServer((host, port), _ScoringRequestHandler)
+        self.server.daemon_threads = True
+        self.server.service = self
+
+    @property
+    def address(self):
+        """(host, port) the server is bound to"""
+        return self.server.server_address
+
+    def serve_forever(self):
+        """Serve requests until shutdown() is called"""
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """Stop the HTTP server and the batch worker"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.stop()
+
+    def handle(self, method, path, body):
+        """
+        Dispatch a request
+
+        Args:
+            method: 'GET' or 'POST'
+            path: Request path without query string
+            body: Parsed JSON body (POST only)
+
+        Returns:
+            tuple: (status code, response dict)
+        """
+        if method == 'POST' and path == '/score':
+            # A list is already a batch; single claims are batched with concurrent requests
+            if isinstance(body, list):
+                return 200, {'scores': self.state.score_claims(self._claim_list(body))}
+            return 200, self.batcher.submit(body)
+
+        if method == 'POST' and path == '/claims':
+            records = self._claim_list(body if isinstance(body, list) else [body])
+            added = self.state.add_claims(records)
+            return 200, {'added': added, 'rejected': len(records) - added}
+
+        if method == 'GET' and path == '/alerts':
+            return 200, {'alerts': self.state.fraud_alerts()}
+
+        if method == 'GET' and path == '/analysis':
+            return 200, self.state.analysis()
+
+        if method == 'GET' and path == '/metrics':
+            sizes = list(self.batcher.batch_sizes)
+            return 200, {
+                'latency': self.metrics.snapshot(),
+                'avg_batch_size': sum(sizes) / len(sizes) if sizes else 0,
+                'state': self.state.stats()
+            }
+
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+
+        return 404, {'error': f"Unknown endpoint: {method} {path}"}
+
+    def _claim_list(self, items):
+        """Validate that every claim in a request body is a JSON object"""
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError('Each claim must be a JSON object')
+        return items
+
+
+class _ScoringRequestHandler(BaseHTTPRequestHandler):
+    """Translates HTTP requests to ScoringService.handle calls"""
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        # Latency metrics replace per-request access logs
+        pass
+
+    def _dispatch(self, method):
+        start = time.perf_counter()
+        path = self.path.split('?', 1)[0]
+        try:
+            body = None
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(body, (dict, list)):
+                    raise ValueError('Request body must be a JSON object or list')
+            status, payload = self.server.service.handle(method, path, body)
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+
+        data = json.dumps(to_json_safe(payload), allow_nan=False, default=str).encode('utf-8')
+
+        # Record before responding so a client never sees metrics missing its own request
+        if status != 404:
+            self.server.service.metrics.record(f"{method} {path}", time.perf_counter() - start)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local claim scoring service')
+    parser.add_argument('--claims', required=True, help='Claims file (CSV, JSON, JSONL or Parquet)')
+    parser.add_argument('--supplier-payments', help='Optional supplier payments file')
+    parser.add_argument('--subsupplier-payments', help='Optional subsupplier payments file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    data_source = FileDataSource(args.claims, args.supplier_payments, args.subsupplier_payments)
+    service = ScoringService(
+        data_source,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_delay=args.max_delay_ms / 1000
+    )
+    host, port = service.address
+    print(f"Scoring service listening on http://{host}:{port}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/cold_start.py
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that should only be imported when a backend is actually used
+HEAVY_MODULES = ['pytesseract', 'pdf2image', 'cv2', 'numpy', 'networkx', 'ipfshttpclient', 'pyarrow']
+
+# Each scenario is timed in a fresh interpreter to capture true cold-start cost
+SCENARIOS = {
+    'import_invoice_processor': (
+        "import document_processing.invoice_processor"
+    ),
+    'init_pipeline': (
+        "from document_processing.processing_pipeline import DocumentProcessingPipeline\n"
+        "DocumentProcessingPipeline()"
+    ),
+    'import_backends': (
+        "import document_processing.backends"
+    ),
+    'import_analyzer': (
+        "from anomaly_detection.model import ProcurementDataAnalyzer\n"
+        "ProcurementDataAnalyzer()"
+    )
+}
+
+# Heavy modules a scenario legitimately loads: pandas itself imports numpy (and pyarrow from pandas 3)
+EXPECTED_MODULES = {
+    'import_analyzer': ['numpy', 'pyarrow']
+}
+
+RUNNER = """
+import sys, time, json
+start = time.perf_counter()
+exec(compile({code!r}, '<scenario>', 'exec'))
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'heavy_loaded': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def run_scenario(code, repeat, expected=()):
+    """
+    Time a scenario in `repeat` fresh interpreters
+
+    Args:
+        code: Python source to execute
+        repeat: Number of fresh processes to run
+        expected: Heavy modules the scenario is allowed to load
+
+    Returns:
+        dict: Timing statistics and the heavy modules left loaded, split into expected and unexpected
+    """
+    timings = []
+    heavy_loaded = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-c', RUNNER.format(code=code, heavy=HEAVY_MODULES)],
+            cwd=AI_DIR,
+            capture_output=True,
+            text=True
+        )
+        if proc.returncode != 0:
+            return {'error': proc.stderr.strip().splitlines()[-1]}
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(sample['seconds'])
+        heavy_loaded = sample['heavy_loaded']
+
+    return {
+        'median_ms': statistics.median(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+        'heavy_loaded': [m for m in heavy_loaded if m in expected],
+        'unexpected_heavy_loaded': [m for m in heavy_loaded if m not in expected]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import time and cold-start cost of the AI modules')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per scenario')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('scenarios', nargs='*', help='Scenarios to run (default: all)')
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    results = {}
+    for name in names:
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario: {name}")
+        results[name] = run_scenario(SCENARIOS[name], args.repeat, EXPECTED_MODULES.get(name, ()))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:28s} ERROR {result['error']}")
+            continue
+        print(
+            f"{name:28s} median {result['median_ms']:8.1f} ms  "
+            f"min {result['min_ms']:8.1f} ms  max {result['max_ms']:8.1f} ms  "
+            f"unexpected heavy modules: {', '.join(result['unexpected_heavy_loaded']) or 'none'}"
+            + (f" (expected: {', '.join(result['heavy_loaded'])})" if result['heavy_loaded'] else '')
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# document_processing/backends.py
+
+import importlib
+
+# Heavy optional dependencies, keyed by the role they play in the pipeline.
+# Nothing here is imported until a backend is first requested, so analysis-only
+# jobs and short-lived workers do not pay for OCR/imaging/IPFS at startup.
+BACKENDS = {
+    'ocr': 'pytesseract',
+    'pdf': 'pdf2image',
+    'imaging': 'cv2',
+    'arrays': 'numpy',
+    'ipfs': 'ipfshttpclient'
+}
+
+_loaded = {}
+
+
+def register_backend(name, backend):
+    """
+    Register or replace a backend
+
+    Args:
+        name: Backend role, e.g. 'ocr'
+        backend: Module name to import on first use, or an already-loaded module/object
+    """
+    _loaded.pop(name, None)
+    if isinstance(backend, str):
+        BACKENDS[name] = backend
+    else:
+        BACKENDS[name] = getattr(backend, '__name__', repr(backend))
+        _loaded[name] = backend
+
+
+def get_backend(name):
+    """
+    Return the backend module for a role, importing it on first use
+
+    Args:
+        name: Backend role, e.g. 'ocr'
+
+    Returns:
+        module: The loaded backend
+    """
+    if name not in _loaded:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown backend: {name}")
+        try:
+            _loaded[name] = importlib.import_module(BACKENDS[name])
+        except ImportError as e:
+            raise ImportError(
+                f"Backend '{name}' requires the '{BACKENDS[name]}' package"
+            ) from e
+    return _loaded[name]
+
+
+def is_loaded(name):
+    """Check whether a backend has already been imported"""
+    return name in _loaded
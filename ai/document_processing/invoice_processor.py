@@ -2,12 +2,9 @@
 
 import os
 import json
-import pytesseract
-from pdf2image import convert_from_path
-import cv2
-import numpy as np
 import re
 from datetime import datetime
+from .backends import get_backend
 
 class InvoiceProcessor:
     """
@@ -70,8 +67,11 @@ class InvoiceProcessor:
     
     def _extract_text_from_pdf(self, pdf_path):
         """Extract text from PDF document"""
+        np = get_backend('arrays')
+        pytesseract = get_backend('ocr')
+        
         # Convert PDF to images
-        images = convert_from_path(pdf_path)
+        images = get_backend('pdf').convert_from_path(pdf_path)
         
         # Extract text from each page
         full_text = ""
@@ -92,18 +92,20 @@ class InvoiceProcessor:
     def _extract_text_from_image(self, image_path):
         """Extract text from image document"""
         # Load image
-        image = cv2.imread(image_path)
+        image = get_backend('imaging').imread(image_path)
         
         # Preprocess image
         preprocessed = self._preprocess_image(image)
         
         # Extract text
-        text = pytesseract.image_to_string(preprocessed)
+        text = get_backend('ocr').image_to_string(preprocessed)
         
         return text
     
     def _preprocess_image(self, image):
         """Preprocess image for better OCR results"""
+        cv2 = get_backend('imaging')
+        
         # Convert to grayscale
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
@@ -224,169 +226,3 @@ class InvoiceProcessor:
         )
         
         return verification
-
-
-# document_processing/ipfs_uploader.py
-
-import ipfshttpclient
-import hashlib
-import os
-import json
-
-class IPFSUploader:
-    """
-    Handles uploading documents to IPFS and retrieving them
-    """
-    
-    def __init__(self, ipfs_api="/ip4/127.0.0.1/tcp/5001"):
-        """
-        Initialize the IPFS uploader
-        
-        Args:
-            ipfs_api: API endpoint for IPFS daemon
-        """
-        self.client = ipfshttpclient.connect(ipfs_api)
-        
-    def upload_file(self, file_path):
-        """
-        Upload a file to IPFS
-        
-        Args:
-            file_path: Path to the file to upload
-            
-        Returns:
-            str: IPFS hash of the uploaded file
-        """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-            
-        # Upload the file to IPFS
-        result = self.client.add(file_path)
-        return result['Hash']
-        
-    def upload_json(self, data):
-        """
-        Upload JSON data to IPFS
-        
-        Args:
-            data: Dictionary to upload as JSON
-            
-        Returns:
-            str: IPFS hash of the uploaded JSON
-        """
-        # Convert data to JSON string
-        json_str = json.dumps(data)
-        
-        # Add the JSON string to IPFS
-        result = self.client.add_str(json_str)
-        return result
-        
-    def get_file(self, ipfs_hash, output_path):
-        """
-        Retrieve a file from IPFS
-        
-        Args:
-            ipfs_hash: IPFS hash of the file
-            output_path: Where to save the retrieved file
-            
-        Returns:
-            str: Path to the downloaded file
-        """
-        self.client.get(ipfs_hash, output_path)
-        return os.path.join(output_path, ipfs_hash)
-        
-    def get_json(self, ipfs_hash):
-        """
-        Retrieve and parse JSON data from IPFS
-        
-        Args:
-            ipfs_hash: IPFS hash of the JSON data
-            
-        Returns:
-            dict: The parsed JSON data
-        """
-        # Get the JSON string from IPFS
-        json_str = self.client.cat(ipfs_hash).decode('utf-8')
-        
-        # Parse the JSON string
-        return json.loads(json_str)
-
-
-# document_processing/processing_pipeline.py
-
-import os
-import json
-from .invoice_processor import InvoiceProcessor
-from .ipfs_uploader import IPFSUploader
-
-class DocumentProcessingPipeline:
-    """
-    Complete pipeline for processing procurement documents
-    """
-    
-    def __init__(self, config_path=None):
-        """
-        Initialize the document processing pipeline
-        
-        Args:
-            config_path: Path to configuration file
-        """
-        self.config = self._load_config(config_path)
-        self.invoice_processor = InvoiceProcessor(config_path)
-        self.ipfs_uploader = IPFSUploader(self.config.get('ipfs_api', "/ip4/127.0.0.1/tcp/5001"))
-        
-    def _load_config(self, config_path):
-        """Load configuration from file or use defaults"""
-        if config_path and os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        else:
-            # Default configuration
-            return {
-                'ipfs_api': "/ip4/127.0.0.1/tcp/5001",
-                'output_dir': "processed_documents"
-            }
-    
-    def process_claim_document(self, document_path, claim_data):
-        """
-        Process a claim document and verify it against claim data
-        
-        Args:
-            document_path: Path to the invoice document
-            claim_data: Data from the blockchain claim
-            
-        Returns:
-            dict: Processing results including extracted data, verification results, and IPFS hash
-        """
-        # Create output directory if it doesn't exist
-        os.makedirs(self.config['output_dir'], exist_ok=True)
-        
-        # Extract data from document
-        extracted_data = self.invoice_processor.process_document(document_path)
-        
-        # Verify claim against extracted data
-        verification_results = self.invoice_processor.verify_claim_against_invoice(
-            claim_data, 
-            extracted_data
-        )
-        
-        # Upload document to IPFS
-        ipfs_hash = self.ipfs_uploader.upload_file(document_path)
-        
-        # Create result package
-        result = {
-            'extracted_data': extracted_data,
-            'verification_results': verification_results,
-            'ipfs_hash': ipfs_hash,
-            'original_claim': claim_data
-        }
-        
-        # Save result to JSON file
-        result_path = os.path.join(
-            self.config['output_dir'], 
-            f"{os.path.basename(document_path)}.json"
-        )
-        with open(result_path, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        return result
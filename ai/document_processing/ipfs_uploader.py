@@ -0,0 +1,92 @@
+# document_processing/ipfs_uploader.py
+
+import hashlib
+import os
+import json
+from .backends import get_backend
+
+class IPFSUploader:
+    """
+    Handles uploading documents to IPFS and retrieving them
+    """
+    
+    def __init__(self, ipfs_api="/ip4/127.0.0.1/tcp/5001"):
+        """
+        Initialize the IPFS uploader. The connection is opened on first use.
+        
+        Args:
+            ipfs_api: API endpoint for IPFS daemon
+        """
+        self.ipfs_api = ipfs_api
+        self._client = None
+    
+    @property
+    def client(self):
+        """IPFS client, connected on first access"""
+        if self._client is None:
+            self._client = get_backend('ipfs').connect(self.ipfs_api)
+        return self._client
+        
+    def upload_file(self, file_path):
+        """
+        Upload a file to IPFS
+        
+        Args:
+            file_path: Path to the file to upload
+            
+        Returns:
+            str: IPFS hash of the uploaded file
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+            
+        # Upload the file to IPFS
+        result = self.client.add(file_path)
+        return result['Hash']
+        
+    def upload_json(self, data):
+        """
+        Upload JSON data to IPFS
+        
+        Args:
+            data: Dictionary to upload as JSON
+            
+        Returns:
+            str: IPFS hash of the uploaded JSON
+        """
+        # Convert data to JSON string
+        json_str = json.dumps(data)
+        
+        # Add the JSON string to IPFS
+        result = self.client.add_str(json_str)
+        return result
+        
+    def get_file(self, ipfs_hash, output_path):
+        """
+        Retrieve a file from IPFS
+        
+        Args:
+            ipfs_hash: IPFS hash of the file
+            output_path: Where to save the retrieved file
+            
+        Returns:
+            str: Path to the downloaded file
+        """
+        self.client.get(ipfs_hash, output_path)
+        return os.path.join(output_path, ipfs_hash)
+        
+    def get_json(self, ipfs_hash):
+        """
+        Retrieve and parse JSON data from IPFS
+        
+        Args:
+            ipfs_hash: IPFS hash of the JSON data
+            
+        Returns:
+            dict: The parsed JSON data
+        """
+        # Get the JSON string from IPFS
+        json_str = self.client.cat(ipfs_hash).decode('utf-8')
+        
+        # Parse the JSON string
+        return json.loads(json_str)
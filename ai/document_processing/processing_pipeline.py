@@ -0,0 +1,78 @@
+# document_processing/processing_pipeline.py
+
+import os
+import json
+from .invoice_processor import InvoiceProcessor
+from .ipfs_uploader import IPFSUploader
+
+class DocumentProcessingPipeline:
+    """
+    Complete pipeline for processing procurement documents
+    """
+    
+    def __init__(self, config_path=None):
+        """
+        Initialize the document processing pipeline
+        
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = self._load_config(config_path)
+        self.invoice_processor = InvoiceProcessor(config_path)
+        self.ipfs_uploader = IPFSUploader(self.config.get('ipfs_api', "/ip4/127.0.0.1/tcp/5001"))
+        
+    def _load_config(self, config_path):
+        """Load configuration from file or use defaults"""
+        if config_path and os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                return json.load(f)
+        else:
+            # Default configuration
+            return {
+                'ipfs_api': "/ip4/127.0.0.1/tcp/5001",
+                'output_dir': "processed_documents"
+            }
+    
+    def process_claim_document(self, document_path, claim_data):
+        """
+        Process a claim document and verify it against claim data
+        
+        Args:
+            document_path: Path to the invoice document
+            claim_data: Data from the blockchain claim
+            
+        Returns:
+            dict: Processing results including extracted data, verification results, and IPFS hash
+        """
+        # Create output directory if it doesn't exist
+        os.makedirs(self.config['output_dir'], exist_ok=True)
+        
+        # Extract data from document
+        extracted_data = self.invoice_processor.process_document(document_path)
+        
+        # Verify claim against extracted data
+        verification_results = self.invoice_processor.verify_claim_against_invoice(
+            claim_data, 
+            extracted_data
+        )
+        
+        # Upload document to IPFS
+        ipfs_hash = self.ipfs_uploader.upload_file(document_path)
+        
+        # Create result package
+        result = {
+            'extracted_data': extracted_data,
+            'verification_results': verification_results,
+            'ipfs_hash': ipfs_hash,
+            'original_claim': claim_data
+        }
+        
+        # Save result to JSON file
+        result_path = os.path.join(
+            self.config['output_dir'], 
+            f"{os.path.basename(document_path)}.json"
+        )
+        with open(result_path, 'w') as f:
+            json.dump(result, f, indent=2)
+        
+        return result
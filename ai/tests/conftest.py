@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests import the AI modules the same way they are run: from the ai/ directory
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if AI_DIR not in sys.path:
+    sys.path.insert(0, AI_DIR)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import AI_DIR
+from document_processing import backends
+
+HEAVY_MODULES = ['pytesseract', 'pdf2image', 'cv2', 'ipfshttpclient']
+
+
+def test_pipeline_construction_loads_no_heavy_backends():
+    # Run in a fresh interpreter so modules imported by other tests do not count
+    code = (
+        "import sys\n"
+        "from document_processing.processing_pipeline import DocumentProcessingPipeline\n"
+        "DocumentProcessingPipeline()\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    proc = subprocess.run([sys.executable, '-c', code], cwd=AI_DIR, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == '[]'
+
+
+def test_registered_backend_is_returned_without_import():
+    fake_ocr = object()
+    backends.register_backend('ocr', fake_ocr)
+    try:
+        assert backends.is_loaded('ocr')
+        assert backends.get_backend('ocr') is fake_ocr
+    finally:
+        backends.register_backend('ocr', 'pytesseract')
+    assert not backends.is_loaded('ocr')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        backends.get_backend('does-not-exist')
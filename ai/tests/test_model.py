@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from conftest import FIXTURES_DIR
+from anomaly_detection.model import ProcurementDataAnalyzer
+
+
+def load_fixtures():
+    claims = pd.read_csv(os.path.join(FIXTURES_DIR, 'claims.csv'))
+    payments = pd.read_csv(os.path.join(FIXTURES_DIR, 'supplier_payments.csv'))
+    return claims, payments
+
+
+def test_dict_output_without_limits_matches_record_lists():
+    claims, payments = load_fixtures()
+    result = ProcurementDataAnalyzer().analyze_payment_patterns(claims.copy(), payments.copy())
+
+    # Rebuild the list sections the way the analyzer built them before columnar output existed
+    claims['amount'] = pd.to_numeric(claims['amount'])
+    claims['create_time'] = pd.to_datetime(claims['create_time'], errors='coerce')
+    merged = pd.merge(claims, payments.groupby('claim_id')['amount'].sum().reset_index(),
+                      on='claim_id', how='left', suffixes=('_claim', '_supplier'))
+    merged['amount_supplier'] = merged['amount_supplier'].fillna(0)
+    merged['retention_amount'] = merged['amount_claim'] - merged['amount_supplier']
+    merged['retention_rate'] = merged['retention_amount'] / merged['amount_claim']
+    high_retention = merged[merged['retention_rate'] > 0.8].groupby('vendor_address').agg({
+        'claim_id': 'count',
+        'amount_claim': 'sum',
+        'retention_amount': 'sum',
+        'retention_rate': 'mean'
+    }).reset_index().to_dict('records')
+
+    assert list(result) == ['claim_stats', 'supplier_flow', 'timing_patterns', 'vendor_patterns']
+    assert result['supplier_flow']['high_retention_vendors'] == high_retention
+    assert result['claim_stats']['threshold_splitting'] == [
+        {'department': '0xD2', 'threshold': 10000, 'count': 3, 'total_amount': 28800}
+    ]
+    assert [row['day_of_week'] for row in result['timing_patterns']['day_of_week_patterns']] == \
+        sorted(claims['create_time'].dropna().dt.dayofweek.unique().tolist())
+    assert list(result['vendor_patterns']['vendor_concentration']) == \
+        ['top_5_vendors', 'top_5_claim_pct', 'top_5_amount_pct']
+    assert len(result['vendor_patterns']['vendor_concentration']['top_5_vendors']) == 5
+    assert isinstance(result['vendor_patterns']['high_variance_vendors']['vendors'], list)
+
+
+def test_top_k_and_offset_page_ranked_rows():
+    claims, payments = load_fixtures()
+    analyzer = ProcurementDataAnalyzer()
+    full = analyzer.analyze_payment_patterns(claims.copy(), payments.copy(), output_format='frames')
+    ranked = full['tables']['supplier_flow.high_retention_vendors'].sort_values(
+        'retention_amount', ascending=False)['vendor_address'].tolist()
+
+    first = analyzer.analyze_payment_patterns(claims.copy(), payments.copy(), top_k=2)
+    second = analyzer.analyze_payment_patterns(claims.copy(), payments.copy(), top_k=2, offset=2)
+
+    assert [row['vendor_address'] for row in first['supplier_flow']['high_retention_vendors']] == ranked[:2]
+    assert [row['vendor_address'] for row in second['supplier_flow']['high_retention_vendors']] == ranked[2:4]
+
+
+def test_frames_output_separates_summary_and_tables():
+    claims, payments = load_fixtures()
+    result = ProcurementDataAnalyzer().analyze_payment_patterns(
+        claims.copy(), payments.copy(), output_format='frames', top_k=1)
+
+    assert set(result) == {'summary', 'tables', 'row_counts'}
+    assert 'high_retention_vendors' not in result['summary']['supplier_flow']
+    assert result['summary']['claim_stats']['total_claims'] == 10
+    assert result['row_counts']['vendor_patterns.vendor_concentration.top_5_vendors'] == 5
+    assert all(len(df) <= 1 for df in result['tables'].values())
+
+
+def test_unknown_output_format_is_rejected():
+    claims, _ = load_fixtures()
+    with pytest.raises(ValueError):
+        ProcurementDataAnalyzer().analyze_payment_patterns(claims, output_format='csv')
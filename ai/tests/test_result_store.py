@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pa = pytest.importorskip('pyarrow')
+
+from anomaly_detection.result_store import ResultTableStore, to_json_safe
+
+
+def make_results(rows=10):
+    table = pd.DataFrame({'vendor_address': [f'v{i}' for i in range(rows)], 'amount': list(range(rows))})
+    return {
+        'summary': {'claim_stats': {'total_claims': rows, 'std_amount': float('nan')}},
+        'tables': {'vendor_patterns.new_vendors.vendors': table},
+        'row_counts': {'vendor_patterns.new_vendors.vendors': rows}
+    }
+
+
+@pytest.fixture(params=['parquet', 'ipc'])
+def store(request, tmp_path):
+    store = ResultTableStore(str(tmp_path), file_format=request.param, row_group_size=3)
+    store.write(make_results())
+    return store
+
+
+@pytest.mark.parametrize('offset, limit, expected', [
+    (0, 3, [0, 1, 2]),
+    (2, 5, [2, 3, 4, 5, 6]),
+    (4, 1, [4]),
+    (8, 5, [8, 9]),
+    (0, 100, list(range(10))),
+    (10, 5, []),
+    (25, 5, []),
+])
+def test_read_page_spans_chunk_boundaries(store, offset, limit, expected):
+    page = store.read_page('vendor_patterns.new_vendors.vendors', offset=offset, limit=limit)
+    assert page.column('amount').to_pylist() == expected
+    assert page.schema.names == ['vendor_address', 'amount']
+
+
+def test_read_page_rejects_paths_outside_manifest(store):
+    with pytest.raises(ValueError):
+        store.read_page('../../vendor_patterns.new_vendors.vendors')
+    with pytest.raises(ValueError):
+        store.read_page('claim_stats')
+
+
+def test_summary_is_strict_json(store):
+    with open(os.path.join(store.output_dir, 'summary.json')) as f:
+        text = f.read()
+    assert 'NaN' not in text
+    summary = json.loads(text)
+    assert summary['summary']['claim_stats']['std_amount'] is None
+    assert summary['tables']['vendor_patterns.new_vendors.vendors']['total_rows'] == 10
+
+
+def test_to_json_safe_converts_numpy_and_timestamps():
+    np = pytest.importorskip('numpy')
+    value = to_json_safe({'a': np.int64(3), 'b': [np.float64('inf'), pd.Timestamp('2026-10-19')], 'c': pd.NaT})
+    assert value == {'a': 3, 'b': [None, '2026-10-19T00:00:00'], 'c': None}
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from conftest import FIXTURES_DIR
+from anomaly_detection.scoring_service import FileDataSource, MicroBatcher, ScoringService, ScoringState
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def fixture_source():
+    return FileDataSource(
+        os.path.join(FIXTURES_DIR, 'claims.csv'),
+        os.path.join(FIXTURES_DIR, 'supplier_payments.csv')
+    )
+
+
+def fixture_state():
+    source = fixture_source()
+    return ScoringState(source.load_claims(), source.load_supplier_payments(), clock=lambda: NOW)
+
+
+@pytest.fixture
+def service():
+    service = ScoringService(fixture_source(), port=0, max_delay=0.05, clock=lambda: NOW)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    yield service
+    service.shutdown()
+
+
+def call(service, path, body=None):
+    host, port = service.address
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=data,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_market_average_uses_trailing_window():
+    state = fixture_state()
+    # Claims 2-9 fall within 30 days of NOW; claim 1 is older and claim 10 has no timestamp
+    assert state.market_average() == pytest.approx(64300 / 8)
+    assert state.market_average(datetime(2026, 1, 1)) is None
+
+
+def test_untimed_claims_count_towards_global_stats():
+    state = fixture_state()
+    assert state.stats()['claims'] == 10
+
+    untimed = ScoringState(pd.DataFrame({'claim_id': [1, 2], 'amount': [100, 300]}), clock=lambda: NOW)
+    assert untimed.stats()['claims'] == 2
+    assert untimed.market_average() is None
+    assert untimed.fraud_alerts() == []
+
+
+def test_fraud_alerts_newest_first():
+    alerts = fixture_state().fraud_alerts()
+    assert [alert['claim_id'] for alert in alerts] == [9, 8]
+    assert [alert['severity'] for alert in alerts] == ['LOW', 'HIGH']
+
+
+def test_fraud_alerts_fall_back_to_default_market_average():
+    claims = pd.DataFrame({'claim_id': [1, 2], 'amount': [25000, 15000],
+                           'create_time': ['2026-01-01T00:00:00', '2026-01-02T00:00:00']})
+    alerts = ScoringState(claims, clock=lambda: NOW).fraud_alerts()
+    assert [alert['claim_id'] for alert in alerts] == [1]
+
+
+def test_score_isolates_malformed_claims():
+    scores = fixture_state().score_claims([
+        {'claim_id': 'ok', 'amount': 9800, 'vendor_address': '0xA', 'department_address': '0xD2',
+         'create_time': '2026-10-19T11:00:00'},
+        {'claim_id': 'bad', 'amount': [1, 2]},
+        'not-a-claim'
+    ])
+    assert scores[0]['reasons'] == ['just_below_threshold', 'threshold_splitting']
+    assert 'error' in scores[1] and scores[1]['claim_id'] == 'bad'
+    assert 'error' in scores[2]
+
+
+def test_micro_batcher_groups_concurrent_submissions():
+    batches = []
+
+    def handler(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, max_delay=0.2)
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(i))) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+
+    assert results == {i: i * 2 for i in range(6)}
+    assert len(batches) < 6
+
+
+def test_score_endpoint_batches_concurrent_requests(service):
+    results = []
+    claim = {'amount': 30000, 'vendor_address': '0xNEW', 'create_time': '2026-10-19T23:30:00'}
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(call(service, '/score', dict(claim, claim_id=i))))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(body['claim_id'] for _, body in results) == list(range(8))
+    assert all(status == 200 for status, _ in results)
+    assert results[0][1]['reasons'] == ['amount_above_2x_market_avg', 'amount_outlier', 'new_vendor',
+                                        'late_night_submission']
+
+    status, metrics = call(service, '/metrics')
+    assert metrics['avg_batch_size'] > 1
+    assert metrics['latency']['POST /score']['count'] == 8
+    assert metrics['latency']['POST /score']['p99_ms'] >= metrics['latency']['POST /score']['p50_ms']
+
+
+def test_claims_push_invalidates_analysis(service):
+    status, before = call(service, '/analysis')
+    assert status == 200
+    assert before['claim_stats']['total_claims'] == 10
+
+    status, body = call(service, '/claims', [
+        {'claim_id': 11, 'amount': 50000, 'vendor_address': '0xZ', 'create_time': '2026-10-19T11:59:00'},
+        {'claim_id': 12, 'amount': 'n/a'}
+    ])
+    assert body == {'added': 1, 'rejected': 1}
+
+    status, after = call(service, '/analysis')
+    assert after['claim_stats']['total_claims'] == 11
+    status, alerts = call(service, '/alerts')
+    assert alerts['alerts'][0]['claim_id'] == 11
+
+
+def test_invalid_bodies_are_rejected(service):
+    assert call(service, '/score', [{'amount': 1}, 'x'])[0] == 400
+    assert call(service, '/claims', [1, 2])[0] == 400
+    assert call(service, '/missing')[0] == 404
+
+
+def test_analysis_response_is_strict_json(service):
+    host, port = service.address
+    with urllib.request.urlopen(f"http://{host}:{port}/analysis") as response:
+        text = response.read().decode('utf-8')
+    assert 'NaN' not in text and 'Infinity' not in text
+
+
+def test_analysis_does_not_block_scoring():
+    state = fixture_state()
+    started = threading.Event()
+    original = state.analyzer.analyze_payment_patterns
+
+    def slow_analysis(*args, **kwargs):
+        started.set()
+        time.sleep(0.5)
+        return original(*args, **kwargs)
+
+    state.analyzer.analyze_payment_patterns = slow_analysis
+    thread = threading.Thread(target=state.analysis)
+    thread.start()
+    started.wait()
+
+    start = time.perf_counter()
+    state.score_claims([{'amount': 100}])
+    state.fraud_alerts()
+    assert time.perf_counter() - start < 0.25
+    thread.join()